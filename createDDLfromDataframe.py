@@ -1,10 +1,13 @@
 def createDDLfromDataframe(df, tablename: str) -> str:
-    """A function that creates a SQL DDL from a Dataframe"""
-    ddl = f"CREATE OR REPLACE TABLE {tableName} (\n"
+    """A function that creates a SQL DDL from a Dataframe; raises ValueError for a Dataframe without columns"""
+    if not df.dtypes:
+        raise ValueError("Cannot create a DDL for a Dataframe without columns")
+    
+    ddl = f"CREATE OR REPLACE TABLE {tablename} (\n"
     
     for column, dtype in df.dtypes:
         ddl += f"\t{column} {dtype},\n"
     
-    ddl = ddl[:-2]
+    ddl = ddl[:-2] + "\n)"
     
     return ddl
\ No newline at end of file
@@ -1,10 +1,214 @@
 import os
-import pytz
-import logging
+import sys
+import atexit
+import collections
+import functools
+import itertools
+import queue
+import re
+import string
+import threading
+import time
+import warnings
+import weakref
 from datetime import datetime
-from typing import Any, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
+from typing import Any, Callable, Final, Optional
 from databricks.sdk.runtime import spark, display, dbutils
 
+# Placeholders a custom config string must use at least one of, and a pattern matching any of them
+_REQUIRED_PLACEHOLDERS: Final = ('timestamp', 'message', 'level', 'envr')
+_REQUIRED_RE: Final = re.compile(r'\{(?:' + '|'.join(_REQUIRED_PLACEHOLDERS) + r')\}')
+
+# Config strings used when none is given, for production-like and development-like environments
+_DEFAULT_CONFIG: Final = '[{timestamp}] : {message}'
+_DEFAULT_DEV_CONFIG: Final = '[{timestamp}] <{envr}> : {message}'
+
+# Placeholders that change on every log call; the parameter names of the compiled render function
+_DYNAMIC_FIELDS: Final = ('timestamp', 'message', 'level')
+
+# ISO-8601 shaped strftime formats that are assembled by hand from the datetime's integer
+# fields, mapped to their date/time separator and whether microseconds are included
+_ISO_FORMATS: Final = {
+    '%Y-%m-%d %H:%M:%S': (' ', False),
+    '%Y-%m-%dT%H:%M:%S': ('T', False),
+    '%Y-%m-%d %H:%M:%S.%f': (' ', True),
+    '%Y-%m-%dT%H:%M:%S.%f': ('T', True),
+}
+
+# Numeric rank of each log level; calls below a logger's `min_level` rank return before any formatting
+_LEVEL_INT: Final = {'INFO': 20, 'SUCCESS': 25, 'WARNING': 30, 'ERROR': 40, 'CRITICAL': 50}
+
+# Most queued writes the `async_write` writer thread joins into a single `write()` call
+_ASYNC_BATCH_SIZE: Final = 256
+
+# Seconds between checks that the `async_write` writer thread is still running while waiting on it
+_ASYNC_POLL_INTERVAL: Final = 0.1
+
+# Queued by `close()`, or when an `async_write` logger is garbage collected, to stop its writer thread
+_STOP: Final = object()
+
+# Buffered and `async_write` loggers that are not closed yet, flushed by a single atexit handler; held
+# weakly so a logger that is rebuilt (e.g. by re-running a notebook cell) can still be collected
+_OPEN_LOGGERS: Final = weakref.WeakSet()
+
+# Column names of the cached log entry tuples, in tuple order
+_CACHE_COLUMNS: Final = ('job_run_id', 'timestamp', 'level', 'envr', 'message')
+
+# Zero-padded renderings of 0-99, indexed instead of formatting each month/day/hour/minute/second
+_TWO_DIGITS: Final = tuple(f'{i:02d}' for i in range(100))
+
+
+@functools.lru_cache(maxsize=128)
+def _has_required_placeholder(format_string: str) -> bool:
+    """Return True if the format string uses at least one of `_REQUIRED_PLACEHOLDERS`; cached per string"""
+    return _REQUIRED_RE.search(format_string) is not None
+
+
+def _in_databricks_job() -> bool:
+    """
+    Return True when running as a Databricks job run rather than in an interactive notebook.
+    
+    Both set `DATABRICKS_RUNTIME_VERSION`, but only a job run's notebook context has a job ID, and
+    job run logs show ANSI codes as raw text. Returns False wherever the context can't be read.
+    """
+    try:
+        return dbutils.notebook.entry_point.getDbutils().notebook().getContext().jobId().isDefined()
+    except Exception:
+        return False
+
+
+@functools.lru_cache(maxsize=1)
+def _zone_keys_by_lower() -> dict[str, str]:
+    """Map each available IANA timezone key, lowercased, to its canonical spelling; built on first use"""
+    return {key.lower(): key for key in available_timezones()}
+
+
+def _resolve_timezone(name: str) -> ZoneInfo:
+    """
+    Look up a timezone, accepting the same names `pytz.timezone()` did in earlier versions.
+    
+    Keys are tried as given first; on a miss they are matched case-insensitively against the
+    available zones (so `'utc'` and `'us/central'` keep working). Unknown or malformed keys, which
+    `ZoneInfo` reports as either `ZoneInfoNotFoundError` or `ValueError`, both raise
+    `ZoneInfoNotFoundError` with the key as its message, like `pytz.UnknownTimeZoneError` did.
+    """
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        pass
+    key = _zone_keys_by_lower().get(name.lower())
+    if key is None:
+        raise ZoneInfoNotFoundError(name) from None
+    return ZoneInfo(key)
+
+
+@functools.lru_cache(maxsize=128)
+def _format_field_names(message: str) -> frozenset[str]:
+    """
+    Return the top-level names of the `{}` placeholders in a message template, including those
+    nested in a format spec (e.g. `width` in `{value:{width}}`); cached per template
+    """
+    names = set()
+    for _, field, spec, _ in string.Formatter().parse(message):
+        if field:
+            names.add(field.partition('.')[0].partition('[')[0])
+        if spec and '{' in spec:
+            names |= _format_field_names(spec)
+    return frozenset(names)
+
+
+def _legacy_cache_message(flag: bool) -> bool:
+    """Read a lone positional bool as the `cache_message` flag earlier versions accepted there, with a warning"""
+    warnings.warn(
+        "passing cache_message positionally is deprecated; use logger.info(message, cache_message=True)",
+        DeprecationWarning,
+        stacklevel=3
+    )
+    return flag
+
+
+def _interpolate(message: Any, args: tuple, kwargs: dict[str, Any]) -> Any:
+    """
+    Apply deferred message arguments, mirroring the stdlib `logging` lazy-argument contract.
+    
+    Positional arguments are %-interpolated (a single dict argument is used as the mapping) and
+    keyword arguments go through `str.format`. Level methods only call this once the level check has
+    passed, so muted calls never build their message. A lone positional bool never gets here; the
+    emitters take it as the legacy `cache_message` flag (see `_legacy_cache_message`).
+    
+    **Raises:**
+        TypeError: If a keyword argument is not a placeholder of the message (e.g. a misspelled
+            `cache_message`), or if positional and keyword arguments are mixed
+    """
+    if kwargs:
+        unused = kwargs.keys() - _format_field_names(message)
+        if unused:
+            raise TypeError(f"unexpected keyword argument(s) not used by the message: {', '.join(sorted(unused))}")
+        if args:
+            raise TypeError("message arguments must be either positional (%-style) or keyword ({}-style), not both")
+        return message.format(**kwargs)
+    if args:
+        if len(args) == 1 and isinstance(args[0], dict):
+            args = args[0]
+        return message % args
+    return message
+
+
+def _drain_queue(pending: queue.SimpleQueue, write: Callable[[str], Any]) -> None:
+    """
+    Writer thread loop for `async_write` mode.
+    
+    Blocks until output is queued, then takes whatever else is already waiting (up to
+    `_ASYNC_BATCH_SIZE` items) and writes it with a single `write()` call. `threading.Event`
+    markers queued by `flush()` are set once the output queued ahead of them has been written.
+    Returns after the batch holding `_STOP`. Takes the queue and write function rather than the
+    logger, so the running thread does not keep its logger alive.
+    
+    **Parameters:**
+        pending (queue.SimpleQueue | queue.Queue): The logger's output queue
+        write (Callable[[str], Any]): The stdout `write` method bound at construction
+    """
+    while True:
+        items = [pending.get()]
+        while len(items) < _ASYNC_BATCH_SIZE:
+            try:
+                items.append(pending.get_nowait())
+            except queue.Empty:
+                break
+        
+        texts = [item for item in items if isinstance(item, str)]
+        try:
+            if texts:
+                write(''.join(texts))
+        except Exception as error:
+            # The batch is lost, but the thread keeps serving later writes; report the loss where
+            # it is still visible, since stdout is what just failed
+            if sys.__stderr__ is not None:
+                print(f"databricksLogger: dropped {len(texts)} queued write(s): {error!r}", file=sys.__stderr__)
+        finally:
+            # Always release flush() callers waiting on this batch, even if the thread is going down
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+        
+        if _STOP in items:
+            return
+
+
+def _stop_writer(pending: queue.SimpleQueue, writer_thread: threading.Thread) -> None:
+    """Ask an `async_write` writer thread to exit once it has written everything queued before now"""
+    if writer_thread.is_alive():
+        pending.put(_STOP)
+
+
+@atexit.register
+def _flush_open_loggers() -> None:
+    """Flush every buffered or `async_write` logger that is still open when the interpreter exits"""
+    for logger in list(_OPEN_LOGGERS):
+        logger.flush()
+
+
 class databricksLogger:
     """
     A lightweight, colorized logging utility for Databricks environments with timezone support.
@@ -14,10 +218,12 @@ class databricksLogger:
     flexible for development and production environments.
     
     **Features:**
-    - ANSI color-coded output for different log levels
+    - ANSI color-coded output for different log levels (skipped when stdout can't render it)
     - Configurable timestamp formats and timezones
     - Custom message formatting with template strings
     - Support for custom placeholders in log format
+    - Optional batching of console writes for bursty logging
+    - Optional background writer thread so log calls never block on stdout
     - Lightweight implementation with minimal dependencies
     
     **Example Usage:**
@@ -50,7 +256,7 @@ class databricksLogger:
     """
     
     # ANSI Color Codes
-    COLORS = {
+    COLORS: Final[dict[str, str]] = {
         'WARNING': '\033[33m',      # Yellow
         'INFO': '',                  # Default/Black (no color code)
         'ERROR': '\033[31m',         # Red
@@ -65,7 +271,13 @@ class databricksLogger:
         config: Optional[str] = None,
         custom_config_values: Optional[dict[str, Any]] = None,
         timestamp_fmt: Optional[str] = None,
-        timezone: Optional[str] = None
+        timezone: Optional[str] = None,
+        buffer_lines: int = 1,
+        flush_interval: Optional[float] = None,
+        async_write: bool = False,
+        async_queue_size: Optional[int] = None,
+        force_color: bool = False,
+        min_level: str = 'INFO'
     ):
         """
         Initialize the databricksLogger instance.
@@ -86,10 +298,37 @@ class databricksLogger:
                 See: https://docs.python.org/3/library/datetime.html#strftime-and-strptime-format-codes
             timezone (Optional[str]): IANA timezone string (e.g., 'America/Chicago', 'UTC', 'Europe/London').
                 Defaults to `'America/Chicago'` (CST)
+            buffer_lines (int): Number of log lines to collect before writing them to stdout in a
+                single `write()` call. Defaults to `1`, which writes every line immediately.
+                Buffered lines are also written by `flush()` and `close()`, whenever an ERROR or CRITICAL
+                message is logged, and when the interpreter exits.
+            flush_interval (Optional[float]): When buffering, the maximum number of seconds a line
+                may wait in the buffer before a background timer flushes it.
+                Defaults to `None` (flush only when the buffer is full)
+            async_write (bool): If True, log calls only hand their output to a queue and a daemon
+                writer thread writes it to stdout, batching whatever has queued up into one
+                `write()` call. `flush()` waits until everything logged so far has been written.
+                Defaults to False
+            async_queue_size (Optional[int]): With `async_write`, the most writes that may be waiting
+                for the writer thread; a log call blocks while the queue is full instead of letting it
+                grow without limit (but writes synchronously if the writer thread has stopped).
+                Defaults to `None` (unbounded, and the cheapest enqueue)
+            force_color (bool): If True, always wrap log lines in ANSI color codes. By default color
+                is only used when stdout is a terminal or an interactive Databricks notebook (not a
+                job run), and never when the `NO_COLOR` environment variable is set. Defaults to False
+            min_level (str): Lowest level that is logged, ranked INFO < SUCCESS < WARNING < ERROR <
+                CRITICAL. Calls below it return immediately, without formatting, printing or caching
+                the message. Defaults to `'INFO'` (log everything)
         
         **Raises:**
             ValueError: If the custom config string doesn't contain at least one required placeholder
-            pytz.UnknownTimeZoneError: If the provided timezone string is invalid
+            ValueError: If `buffer_lines` is less than 1
+            ValueError: If `min_level` is not one of the log levels above
+            KeyError: If the config string uses a placeholder that is neither built-in nor a key of
+                `custom_config_values`
+            zoneinfo.ZoneInfoNotFoundError: If the provided timezone string is invalid (a `KeyError`
+                subclass, like the `pytz.UnknownTimeZoneError` raised by earlier versions). Names are
+                matched case-insensitively, as pytz did
         
         **Example:**
             ```python
@@ -104,6 +343,9 @@ class databricksLogger:
         """
         self.envr = envr
         
+        # Set minimum level - calls below it are dropped before any work is done
+        self.set_level(min_level)
+        
         # Set config format - use 'default' if not specified
         if config is not None:
             # Validate custom format string
@@ -111,15 +353,18 @@ class databricksLogger:
             self.config = config
         else:
             if envr.lower() in ['dev', 'development', 'test', 'testing']:
-                self.config = '[{timestamp}] <{envr}> : {message}'
+                self.config = _DEFAULT_DEV_CONFIG
             else: 
-                self.config = '[{timestamp}] : {message}'
+                self.config = _DEFAULT_CONFIG
 
         # Set custom dictionary for additional user-defined values in logging message
         if custom_config_values is not None:
             self.custom_config_values = custom_config_values
         else:
             self.custom_config_values = {}  
+
+        # Placeholder values that stay the same for every log call, merged once instead of per call
+        self._static_kwargs = {'envr': self.envr, **self.custom_config_values}
         
         # Set timestamp format - use Python's strftime format
         if timestamp_fmt is not None:
@@ -129,12 +374,84 @@ class databricksLogger:
         
         # Set timezone - default to America/Chicago (CST)
         if timezone is not None:
-            self.timezone = pytz.timezone(timezone)
+            self.timezone = _resolve_timezone(timezone)
         else:
-            self.timezone = pytz.timezone('America/Chicago')
+            self.timezone = ZoneInfo('America/Chicago')
+
+        # Formats without sub-second fields render the same string for a whole second, so the
+        # last rendered (second, timestamp) pair is reused until the wall-clock second changes
+        self._cache_timestamp = '%f' not in self.timestamp_fmt
+        self._iso_format = _ISO_FORMATS.get(self.timestamp_fmt)
+        self._now = self._make_clock()
+
+        # Set output buffering - one line per write unless batching is requested
+        if buffer_lines < 1:
+            raise ValueError("buffer_lines must be at least 1")
+        self.buffer_lines = buffer_lines
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._buffer_lock = threading.RLock()
+        self._flush_timer = None
+        # Bind stdout's write once rather than going through print() and a sys.stdout lookup per line.
+        # Each write already carries its trailing newline; on a terminal whose stream doesn't flush on
+        # newlines by itself, flush after every write so lines still show up as they are logged
+        isatty = getattr(sys.stdout, 'isatty', None)
+        self._stdout_is_tty = isatty is not None and isatty()
+        self._write = sys.stdout.write
+        if self._stdout_is_tty and not getattr(sys.stdout, 'line_buffering', False):
+            stdout_write, stdout_flush = sys.stdout.write, sys.stdout.flush
+            
+            def write_and_flush(text: str) -> None:
+                stdout_write(text)
+                stdout_flush()
+            
+            self._write = write_and_flush
+
+        # Set background writing - log calls enqueue their output and a daemon thread writes it
+        self.async_write = async_write
+        if async_write:
+            self._queue = queue.SimpleQueue() if async_queue_size is None else queue.Queue(maxsize=async_queue_size)
+            self._writer_thread = threading.Thread(
+                target=_drain_queue,
+                args=(self._queue, self._write),
+                name="databricksLogger-writer",
+                daemon=True
+            )
+            self._writer_thread.start()
+            self._write_direct = self._write
+            self._write = self._enqueue
+
+        self._buffered = buffer_lines > 1 or async_write
+        if self._buffered:
+            _OPEN_LOGGERS.add(self)
 
         self.caching = False
-        self.cached_logs = []
+        self.cached_logs = collections.deque()
+
+        # Set color output - ANSI codes are only wasted bytes when written to a pipe, a file or a job
+        # run's log; interactive Databricks notebooks render them even though their stdout is not a TTY
+        self._use_color = force_color or (
+            not os.environ.get('NO_COLOR')
+            and (
+                self._stdout_is_tty
+                or ('DATABRICKS_RUNTIME_VERSION' in os.environ and not _in_databricks_job())
+            )
+        )
+
+        # Uncolored levels (INFO, or all of them without color output) get no reset code either,
+        # so their lines are written as-is
+        self._wrap = {
+            level: (color, self.COLORS['RESET'] if color else '') if self._use_color else ('', '')
+            for level, color in self.COLORS.items() if level != 'RESET'
+        }
+
+        # Build one emitter per level, which all logging goes through (see `_log`), and shadow the
+        # level methods with them directly unless a subclass overrides them
+        self._emitters = {level: self._make_emitter(level) for level in self._wrap}
+        for level, emit in self._emitters.items():
+            name = level.lower()
+            if getattr(type(self), name) is getattr(databricksLogger, name):
+                setattr(self, name, emit)
     
     def _validate_format_string(self, format_string: str) -> None:
         """
@@ -159,62 +476,359 @@ class databricksLogger:
             logger._validate_format_string("{custom}")  # Raises ValueError
             ```
         """
-        required_placeholders = ['{timestamp}', '{message}', '{level}', '{envr}']
+        if not _has_required_placeholder(format_string):
+            required_placeholders = ', '.join(f'{{{name}}}' for name in _REQUIRED_PLACEHOLDERS)
+            raise ValueError(f"Format string must contain at least one of: {required_placeholders}")
+    
+    def _compile_format(self, level: Optional[str] = None) -> Callable[[str, Any, str], str]:
+        """
+        Compile the config string into the render function a level emitter uses (see `_make_emitter`).
+        
+        The config string is parsed once with `string.Formatter().parse()` into literal text and
+        placeholders. `{envr}` and any `custom_config_values` placeholders cannot change after
+        `__init__`, so they are formatted up front and baked into the surrounding literal text;
+        only `{timestamp}`, `{message}` and `{level}` are filled in on each log call. The result is
+        turned into the source of a one-line function returning a single f-string, e.g.
+        `return f'[{timestamp}] : {message}'` for the default config, and compiled with `exec`.
         
-        if not any(placeholder in format_string for placeholder in required_placeholders):
-            raise ValueError(
-                f"Format string must contain at least one of: {', '.join(required_placeholders)}"
+        When compiling for a single level, `{level}` and that level's ANSI color prefix/reset are
+        baked into the literal text as well, so the colored line comes out of one f-string.
+        
+        **Parameters:**
+            level (Optional[str]): Log level to specialise the render function for. Defaults to
+                `None`, which renders any level and leaves the line uncolored.
+        
+        **Returns:**
+            Callable[[str, Any, str], str]: A function taking `(timestamp, message, level)` and
+                returning the formatted log line; the `level` argument is ignored when specialised
+        
+        **Notes:**
+            Config strings that apply a conversion, format spec, or attribute/index lookup to a
+            per-call placeholder (e.g. `{level:<8}`) fall back to `_render_generic`, which calls
+            `str.format` on every log call like earlier versions did.
+        """
+        def escape(text: str) -> str:
+            return text.replace('{', '{{').replace('}', '}}')
+        
+        color, reset = self._wrap[level] if level is not None else ('', '')
+        body = [escape(color)]
+        
+        for literal, field, spec, conversion in string.Formatter().parse(self.config):
+            body.append(escape(literal))
+            if field is None:
+                continue
+            
+            if field == 'level' and level is not None and not spec and not conversion:
+                body.append(escape(level))
+            elif field in _DYNAMIC_FIELDS and not spec and not conversion:
+                body.append('{' + field + '}')
+            elif field.partition('.')[0].partition('[')[0] in _DYNAMIC_FIELDS or '{' in (spec or ''):
+                if not color:
+                    return self._render_generic
+                render_generic = self._render_generic
+                return lambda timestamp, message, level: color + render_generic(timestamp, message, level) + reset
+            else:
+                placeholder = '{' + field + (f'!{conversion}' if conversion else '') + (f':{spec}' if spec else '') + '}'
+                body.append(escape(placeholder.format_map(self._static_kwargs)))
+        body.append(escape(reset))
+        
+        # repr() quotes and escapes the literal text; the only replacement fields left in the
+        # f-string are the fixed per-call parameter names, so the generated code is just this
+        source = f"def render(timestamp, message, level):\n    return f{''.join(body)!r}\n"
+        namespace = {}
+        exec(compile(source, '<databricksLogger config>', 'exec'), namespace)
+        return namespace['render']
+    
+    def _render_generic(self, timestamp: str, message: Any, level: str) -> str:
+        """
+        Render a log line by calling `str.format` on the config string; see `_compile_format`.
+        
+        Only the three per-call values are put in a fresh mapping; `envr` and custom values are
+        looked up from the pre-merged static values behind it in a `collections.ChainMap`, so they are
+        never copied per call.
+        """
+        return self.config.format_map(
+            collections.ChainMap({'timestamp': timestamp, 'message': message, 'level': level}, self._static_kwargs)
+        )
+    
+    def _render_timestamp(self, moment: datetime) -> str:
+        """
+        Render a datetime with the configured timestamp format.
+        
+        ISO-8601 shaped formats (see `_ISO_FORMATS`) are assembled directly from the datetime's
+        integer fields, which skips both `strftime()`'s walk over the format string and the UTC
+        offset lookup `isoformat()` does for aware datetimes.
+        
+        **Parameters:**
+            moment (datetime): Timezone-aware datetime to render
+        
+        **Returns:**
+            str: The rendered timestamp
+        """
+        iso_format = self._iso_format
+        if iso_format is not None:
+            sep, with_microseconds = iso_format
+            two = _TWO_DIGITS
+            rendered = (
+                f"{moment.year:04d}-{two[moment.month]}-{two[moment.day]}"
+                f"{sep}{two[moment.hour]}:{two[moment.minute]}:{two[moment.second]}"
             )
+            if with_microseconds:
+                rendered = f"{rendered}.{moment.microsecond:06d}"
+            return rendered
+        return moment.strftime(self.timestamp_fmt)
     
-    def _format_message(self, message: str, level: str, cache_message: bool = False) -> str:
+    def _make_clock(self) -> Callable[[], tuple[str, datetime]]:
+        """
+        Build the function that returns the current time in the configured timezone, both rendered
+        with `timestamp_fmt` and as the `datetime` it was rendered from.
+        
+        For formats without sub-second fields the (rendered, datetime) pair is cached and reused
+        until the wall-clock second changes, so the datetime is truncated to the second like the
+        string. The timezone, clock and render helpers are bound as closure variables so each call
+        does local lookups rather than attribute lookups on `self`.
+        
+        **Returns:**
+            Callable[[], tuple[str, datetime]]: A zero-argument function returning the rendered
+                timestamp and the timezone-aware datetime behind it
         """
-        Format the message with timestamp and color based on the configured format.
+        timezone = self.timezone
+        render_timestamp = self._render_timestamp
+        
+        if not self._cache_timestamp:
+            now = datetime.now
+            
+            def current_time() -> tuple[str, datetime]:
+                moment = now(timezone)
+                return render_timestamp(moment), moment
+            
+            return current_time
         
-        This internal method combines all configuration (timestamp, timezone, custom values)
-        with the provided message and log level to produce a formatted, color-coded output string.
+        clock = time.time
+        fromtimestamp = datetime.fromtimestamp
+        last_second = -1
+        last = ('', None)
+        
+        def current_second() -> tuple[str, datetime]:
+            nonlocal last_second, last
+            second = int(clock())
+            if second != last_second:
+                moment = fromtimestamp(second, timezone)
+                # Publish the new pair before the second it belongs to, so a concurrent caller that
+                # sees the new second can never get the previous second's pair
+                last = (render_timestamp(moment), moment)
+                last_second = second
+            return last
+        
+        return current_second
+    
+    def _cache_log(self, moment: datetime, level: str, message: str) -> None:
+        """
+        Add a log entry to the cache that `persist_cache()` writes to the Unity Catalog table.
+        
+        Entries are plain tuples in `_CACHE_COLUMNS` order; they only become rows when persisted. The
+        time is kept as a `datetime` so it lands in the table's TIMESTAMP column without a string
+        round-trip.
         
         **Parameters:**
+            moment (datetime): Time of the log call, the same instant the printed timestamp shows
+            level (str): The log level
             message (str): The log message content
+        """
+        self.cached_logs.append((self.job_run_id, moment, level, self.envr, str(message)))
+    
+    def _make_emitter(self, level: str) -> Callable[..., None]:
+        """
+        Build the logging function for one level; every log call at that level runs it (see `_log`).
+        
+        The returned closure checks `min_level`, interpolates deferred arguments, renders through a
+        config string compiled for this level alone, with the level name and its color codes baked in,
+        then caches and writes the line. The bound helpers are captured as constants, so a log call
+        skips the level-to-color lookup, the color concatenation and most attribute lookups. It carries
+        the level method's name and docstring, so instances can expose it as that method.
+        
+        **Parameters:**
             level (str): The log level ('INFO', 'WARNING', 'ERROR', 'SUCCESS', 'CRITICAL')
         
         **Returns:**
-            str: ANSI color-coded formatted message string ready for console output
-        
-        **Internal Process:**
-            1. Generates timestamp in the configured timezone
-            2. Formats the message using the configured format string
-            3. Applies ANSI color codes based on log level
-            4. Returns the formatted and colored string
-        """
-        # Get current timestamp in configured timezone
-        timestamp = datetime.now(self.timezone).strftime(self.timestamp_fmt)
-        
-        # Format the message using the configured format string
-        formatted = self.config.format(
-            timestamp=timestamp,
-            message=message,
-            level=level,
-            envr=self.envr,
-            **(self.custom_config_values or {})
-        )
-
-        if self.caching and cache_message:
-            log_entry = {
-                "job_run_id": self.job_run_id,
-                "timestamp": timestamp,
-                "level": level,
-                "envr": self.envr,
-                "message": message
-            }
-            self.cached_logs.append(log_entry)
+            Callable[..., None]: A function with the same signature as the level method
+        """
+        rank = _LEVEL_INT[level]
+        urgent = rank >= _LEVEL_INT['ERROR']
+        now = self._now
+        render = self._compile_format(level)
+        cache_log = self._cache_log
+        write_line = self._write_line
+        
+        def emit(message: Any, *args: Any, cache_message: bool = False, **kwargs: Any) -> None:
+            if rank < self._min_level:
+                return
+            if args or kwargs:
+                if len(args) == 1 and args[0].__class__ is bool:
+                    cache_message = _legacy_cache_message(args[0]) or cache_message
+                    args = ()
+                message = _interpolate(message, args, kwargs)
+            timestamp, moment = now()
+            line = render(timestamp, message, level)
+            if cache_message and self.caching:
+                cache_log(moment, level, message)
+            write_line(line, urgent)
+        
+        method = getattr(databricksLogger, level.lower())
+        emit.__name__, emit.__qualname__, emit.__doc__ = method.__name__, method.__qualname__, method.__doc__
+        return emit
+    
+    def _write_line(self, line: str, urgent: bool = False) -> None:
+        """
+        Write a formatted log line to stdout, batching it when `buffer_lines` is greater than 1.
+        
+        Lines go to the `sys.stdout` that was active when the logger was created; later
+        reassignments of `sys.stdout` (e.g. `contextlib.redirect_stdout`) are not picked up.
+        
+        **Parameters:**
+            line (str): The formatted log line, without a trailing newline
+            urgent (bool): If True and output is buffered or asynchronous, flush right away so the
+                line (and everything logged before it) is visible before the call returns.
+                Used for ERROR and CRITICAL messages. Defaults to False
+        """
+        if self.buffer_lines == 1:
+            self._write(line + '\n')
+        else:
+            with self._buffer_lock:
+                self._buffer.append(line)
+                if len(self._buffer) >= self.buffer_lines:
+                    self._flush_buffer()
+                elif self.flush_interval is not None and self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self.flush_interval, self._flush_buffer)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+        
+        if urgent and self._buffered:
+            self.flush()
+    
+    def _enqueue(self, text: str) -> None:
+        """
+        Hand output to the `async_write` writer thread.
+        
+        If the writer thread is no longer running, whatever it left in the queue and then `text` are
+        written synchronously instead, so output is never queued where nothing will write it.
+        
+        **Parameters:**
+            text (str): Output to write, including its trailing newline
+        """
+        if not self._put(text):
+            self._write_queued()
+            self._write_direct(text)
+    
+    def _put(self, item: Any) -> bool:
+        """
+        Put an item on the `async_write` queue, returning False instead if the writer thread has stopped.
+        
+        With a bounded queue (`async_queue_size`) the put waits while the queue is full, but checks
+        every `_ASYNC_POLL_INTERVAL` seconds that the writer thread is still there to empty it.
+        """
+        put = self._queue.put
+        while self._writer_thread.is_alive():
+            try:
+                put(item, timeout=_ASYNC_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def _write_queued(self) -> None:
+        """Synchronously write output left in the queue by a stopped writer thread, releasing `flush()` waiters"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if isinstance(item, str):
+                self._write_direct(item)
+            else:
+                item.set()
+    
+    def _flush_buffer(self) -> None:
+        """
+        Hand the lines collected by `buffer_lines` to the output in one write, without waiting for them.
+        
+        Used when the buffer fills and when `flush_interval` elapses; in `async_write` mode the lines
+        are only queued for the writer thread, so the log call that filled the buffer does not wait
+        on stdout. `flush()` does this and then waits.
+        """
+        with self._buffer_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._buffer:
+                self._write('\n'.join(self._buffer) + '\n')
+                self._buffer = []
+    
+    def flush(self) -> None:
+        """
+        Write any buffered log lines to stdout.
+        
+        Only has an effect when the logger was created with `buffer_lines` greater than 1 or with
+        `async_write=True`; lines are otherwise written as soon as they are logged. Called
+        automatically after ERROR and CRITICAL messages and at interpreter exit; a full buffer or an
+        elapsed `flush_interval` hands the buffered lines on without waiting for them to be written.
+        In `async_write` mode this blocks until the writer thread has written everything queued so far,
+        or writes it synchronously if the writer thread has stopped.
+        
+        **Example:**
+            ```python
+            logger = databricksLogger(envr="prod", buffer_lines=100)
+            for record in records:
+                logger.info(f"Processed {record}")
+            logger.flush()  # Make sure the last, partially filled batch is shown
+            ```
+        """
+        self._flush_buffer()
+        
+        if self.async_write:
+            written = threading.Event()
+            if self._put(written):
+                while not written.wait(_ASYNC_POLL_INTERVAL):
+                    if not self._writer_thread.is_alive():
+                        break
+            if not self._writer_thread.is_alive():
+                self._write_queued()
+    
+    def close(self) -> None:
+        """
+        Flush any buffered output and release the logger's background resources.
         
-        # Apply color
-        color = self.COLORS.get(level, '')
-        reset = self.COLORS['RESET']
+        Stops the `async_write` writer thread and drops the logger from the flush done at interpreter
+        exit. Only needed for loggers created with `buffer_lines` greater than 1 or `async_write=True`;
+        loggers that are garbage collected are cleaned up the same way. The logger stays usable
+        afterwards, but writes every line synchronously as it is logged. Calling it again does nothing.
         
-        return f"{color}{formatted}{reset}"
+        **Example:**
+            ```python
+            logger = databricksLogger(envr="prod", async_write=True)
+            try:
+                run_pipeline(logger)
+            finally:
+                logger.close()
+            ```
+        """
+        self.flush()
+        _OPEN_LOGGERS.discard(self)
+        self.buffer_lines = 1
+        self._buffered = False
+        if self.async_write:
+            _stop_writer(self._queue, self._writer_thread)
+            self._writer_thread.join()
+    
+    def __del__(self) -> None:
+        # A buffered or async logger dropped without close(), e.g. rebuilt by re-running a notebook
+        # cell: hand its buffered lines on and let the writer thread exit once they are written
+        if getattr(self, '_buffered', False):
+            self._flush_buffer()
+            if self.async_write:
+                _stop_writer(self._queue, self._writer_thread)
     
-    def info(self, message: str, cache_message: bool = False) -> None:
+    def info(self, message: Any, *args: Any, cache_message: bool = False, **kwargs: Any) -> None:
         """
         Log an informational message.
         
@@ -222,9 +836,18 @@ class databricksLogger:
         Optionally caches the message for later persistence to a Unity Catalog table.
         
         **Parameters:**
-            message (str): The message to log
+            message (Any): The message to log. May contain `%`-style placeholders filled from `args`
+                or `{}`-style placeholders filled from `kwargs`; interpolation only happens if the
+                level is enabled.
+            *args (Any): Values for `%`-style placeholders in `message`
             cache_message (bool): If True, adds this message to the cache for later persistence.
-                Defaults to False. Caching must be initialized via `init_caching()` first.
+                Defaults to False. Caching must be initialized via `init_caching()` first. Pass it by
+                keyword: a lone positional bool (`logger.info("msg", True)`, as earlier versions
+                allowed) is still read as this flag, with a `DeprecationWarning`, so log a single
+                boolean value through a `{}` placeholder instead of `%s`.
+            **kwargs (Any): Values for `{}`-style placeholders in `message`; a keyword the message
+                doesn't use (such as a misspelled `cache_message`) raises `TypeError`, as does mixing
+                `args` and `kwargs`
         
         **Raises:**
             Warning: If cache_message=True but caching is not initialized, logs a warning
@@ -233,12 +856,12 @@ class databricksLogger:
             ```python
             logger.info("User logged in successfully")
             logger.info("Processing started", cache_message=True)
+            logger.info("Loaded %d rows from %s", row_count, table_name)  # Formatted only if INFO is enabled
             ```
         """
-        colored_message = self._format_message(message, 'INFO', cache_message=cache_message)
-        print(colored_message)
+        self._log('INFO', message, *args, cache_message=cache_message, **kwargs)
     
-    def warning(self, message: str, cache_message: bool = False) -> None:
+    def warning(self, message: Any, *args: Any, cache_message: bool = False, **kwargs: Any) -> None:
         """
         Log a warning message.
         
@@ -247,9 +870,18 @@ class databricksLogger:
         Optionally caches the message for later persistence to a Unity Catalog table.
         
         **Parameters:**
-            message (str): The message to log
+            message (Any): The message to log. May contain `%`-style placeholders filled from `args`
+                or `{}`-style placeholders filled from `kwargs`; interpolation only happens if the
+                level is enabled.
+            *args (Any): Values for `%`-style placeholders in `message`
             cache_message (bool): If True, adds this message to the cache for later persistence.
-                Defaults to False. Caching must be initialized via `init_caching()` first.
+                Defaults to False. Caching must be initialized via `init_caching()` first. Pass it by
+                keyword: a lone positional bool (`logger.info("msg", True)`, as earlier versions
+                allowed) is still read as this flag, with a `DeprecationWarning`, so log a single
+                boolean value through a `{}` placeholder instead of `%s`.
+            **kwargs (Any): Values for `{}`-style placeholders in `message`; a keyword the message
+                doesn't use (such as a misspelled `cache_message`) raises `TypeError`, as does mixing
+                `args` and `kwargs`
         
         **Example:**
             ```python
@@ -257,10 +889,9 @@ class databricksLogger:
             logger.warning("Low memory detected", cache_message=True)
             ```
         """
-        colored_message = self._format_message(message, 'WARNING', cache_message=cache_message)
-        print(colored_message)
+        self._log('WARNING', message, *args, cache_message=cache_message, **kwargs)
     
-    def error(self, message: str, cache_message: bool = False) -> None:
+    def error(self, message: Any, *args: Any, cache_message: bool = False, **kwargs: Any) -> None:
         """
         Log an error message.
         
@@ -269,9 +900,18 @@ class databricksLogger:
         Optionally caches the message for later persistence to a Unity Catalog table.
         
         **Parameters:**
-            message (str): The message to log
+            message (Any): The message to log. May contain `%`-style placeholders filled from `args`
+                or `{}`-style placeholders filled from `kwargs`; interpolation only happens if the
+                level is enabled.
+            *args (Any): Values for `%`-style placeholders in `message`
             cache_message (bool): If True, adds this message to the cache for later persistence.
-                Defaults to False. Caching must be initialized via `init_caching()` first.
+                Defaults to False. Caching must be initialized via `init_caching()` first. Pass it by
+                keyword: a lone positional bool (`logger.info("msg", True)`, as earlier versions
+                allowed) is still read as this flag, with a `DeprecationWarning`, so log a single
+                boolean value through a `{}` placeholder instead of `%s`.
+            **kwargs (Any): Values for `{}`-style placeholders in `message`; a keyword the message
+                doesn't use (such as a misspelled `cache_message`) raises `TypeError`, as does mixing
+                `args` and `kwargs`
         
         **Example:**
             ```python
@@ -279,10 +919,9 @@ class databricksLogger:
             logger.error("Processing failed with error code 500", cache_message=True)
             ```
         """
-        colored_message = self._format_message(message, 'ERROR', cache_message=cache_message)
-        print(colored_message)
+        self._log('ERROR', message, *args, cache_message=cache_message, **kwargs)
     
-    def critical(self, message: str, cache_message: bool = False) -> None:
+    def critical(self, message: Any, *args: Any, cache_message: bool = False, **kwargs: Any) -> None:
         """
         Log a critical message.
         
@@ -291,9 +930,18 @@ class databricksLogger:
         Optionally caches the message for later persistence to a Unity Catalog table.
         
         **Parameters:**
-            message (str): The message to log
+            message (Any): The message to log. May contain `%`-style placeholders filled from `args`
+                or `{}`-style placeholders filled from `kwargs`; interpolation only happens if the
+                level is enabled.
+            *args (Any): Values for `%`-style placeholders in `message`
             cache_message (bool): If True, adds this message to the cache for later persistence.
-                Defaults to False. Caching must be initialized via `init_caching()` first.
+                Defaults to False. Caching must be initialized via `init_caching()` first. Pass it by
+                keyword: a lone positional bool (`logger.info("msg", True)`, as earlier versions
+                allowed) is still read as this flag, with a `DeprecationWarning`, so log a single
+                boolean value through a `{}` placeholder instead of `%s`.
+            **kwargs (Any): Values for `{}`-style placeholders in `message`; a keyword the message
+                doesn't use (such as a misspelled `cache_message`) raises `TypeError`, as does mixing
+                `args` and `kwargs`
         
         **Example:**
             ```python
@@ -301,10 +949,9 @@ class databricksLogger:
             logger.critical("Database unavailable", cache_message=True)
             ```
         """
-        colored_message = self._format_message(message, 'CRITICAL', cache_message=cache_message)
-        print(colored_message)
+        self._log('CRITICAL', message, *args, cache_message=cache_message, **kwargs)
     
-    def success(self, message: str, cache_message: bool = False) -> None:
+    def success(self, message: Any, *args: Any, cache_message: bool = False, **kwargs: Any) -> None:
         """
         Log a success message.
         
@@ -313,9 +960,18 @@ class databricksLogger:
         Optionally caches the message for later persistence to a Unity Catalog table.
         
         **Parameters:**
-            message (str): The message to log
+            message (Any): The message to log. May contain `%`-style placeholders filled from `args`
+                or `{}`-style placeholders filled from `kwargs`; interpolation only happens if the
+                level is enabled.
+            *args (Any): Values for `%`-style placeholders in `message`
             cache_message (bool): If True, adds this message to the cache for later persistence.
-                Defaults to False. Caching must be initialized via `init_caching()` first.
+                Defaults to False. Caching must be initialized via `init_caching()` first. Pass it by
+                keyword: a lone positional bool (`logger.info("msg", True)`, as earlier versions
+                allowed) is still read as this flag, with a `DeprecationWarning`, so log a single
+                boolean value through a `{}` placeholder instead of `%s`.
+            **kwargs (Any): Values for `{}`-style placeholders in `message`; a keyword the message
+                doesn't use (such as a misspelled `cache_message`) raises `TypeError`, as does mixing
+                `args` and `kwargs`
         
         **Example:**
             ```python
@@ -323,10 +979,70 @@ class databricksLogger:
             logger.success("Job finished successfully", cache_message=True)
             ```
         """
-        colored_message = self._format_message(message, 'SUCCESS', cache_message=cache_message)
-        print(colored_message)
+        self._log('SUCCESS', message, *args, cache_message=cache_message, **kwargs)
 
-    def init_caching(self, uc_table_name: str) -> None:
+    def _log(self, level: str, message: Any, *args: Any, cache_message: bool = False, **kwargs: Any) -> None:
+        """Log a message at an already validated, upper-case level through that level's emitter (see `_make_emitter`)"""
+        self._emitters[level](message, *args, cache_message=cache_message, **kwargs)
+    
+    def set_level(self, min_level: str) -> None:
+        """
+        Change the lowest level this logger outputs.
+        
+        Calls below the new level return immediately from then on, without formatting, printing or
+        caching the message (see `min_level` in `__init__`).
+        
+        **Parameters:**
+            min_level (str): One of 'INFO', 'SUCCESS', 'WARNING', 'ERROR', 'CRITICAL' (case-insensitive)
+        
+        **Raises:**
+            ValueError: If `min_level` is not one of the log levels above
+        
+        **Example:**
+            ```python
+            logger.set_level("WARNING")
+            logger.info("Skipped entirely")
+            logger.error("Still printed")
+            ```
+        """
+        if min_level.upper() not in _LEVEL_INT:
+            raise ValueError(f"min_level must be one of: {', '.join(_LEVEL_INT)}")
+        self.min_level = min_level.upper()
+        self._min_level = _LEVEL_INT[self.min_level]
+    
+    def log(self, level: str, message: Any, *args: Any, cache_message: bool = False, **kwargs: Any) -> None:
+        """
+        Log a message at a level chosen at runtime.
+        
+        Equivalent to calling the matching level method, e.g. `logger.log("ERROR", ...)` is
+        `logger.error(...)`. Like the level methods, `args`/`kwargs` are only interpolated into the
+        message once the level check has passed.
+        
+        **Parameters:**
+            level (str): One of 'INFO', 'SUCCESS', 'WARNING', 'ERROR', 'CRITICAL' (case-insensitive)
+            message (Any): The message to log; see `info()` for placeholder support
+            *args (Any): Values for `%`-style placeholders in `message`
+            cache_message (bool): If True, adds this message to the cache for later persistence.
+                Defaults to False. Must be passed by keyword.
+            **kwargs (Any): Values for `{}`-style placeholders in `message`
+        
+        **Raises:**
+            ValueError: If `level` is not one of the log levels above
+        
+        **Example:**
+            ```python
+            level = "WARNING" if retries else "INFO"
+            logger.log(level, "Finished after %d retries", retries)
+            ```
+        """
+        level = level.upper()
+        if level not in _LEVEL_INT:
+            raise ValueError(f"level must be one of: {', '.join(_LEVEL_INT)}")
+        if _LEVEL_INT[level] < self._min_level:
+            return
+        getattr(self, level.lower())(message, *args, cache_message=cache_message, **kwargs)
+    
+    def init_caching(self, uc_table_name: str, max_cached_logs: Optional[int] = None) -> None:
         """
         Initialize log message caching for persistence to a Unity Catalog table.
         
@@ -337,17 +1053,25 @@ class databricksLogger:
         **Parameters:**
             uc_table_name (str): The fully qualified Unity Catalog table name where logs will be persisted.
                 Format: `<catalog>.<schema>.<table>` (e.g., `main.logs.job_logs`)
-                The table must already exist and should have columns: job_run_id, envr, log_timestamp, level, message
+                The table must already exist and should have STRING columns job_run_id, level, envr, message
+                and a TIMESTAMP column timestamp
+            max_cached_logs (Optional[int]): Maximum number of entries kept in the cache; once full, the
+                oldest entries are dropped as new ones are cached. Defaults to `None` (unbounded)
         
         **Raises:**
             ValueError: If the specified table does not exist in the catalog
+            ValueError: If the table is missing one of the columns above or has it with another type,
+                e.g. the STRING `timestamp` column earlier versions wrote (see CHANGELOG.md)
             ValueError: If job run ID cannot be determined from notebook context or job parameters
         
         **Side Effects:**
             - Sets `self.caching = True` if successful
-            - Initializes `self.cached_logs = []` as an empty list
+            - Rebuilds `self.cached_logs` as a `collections.deque` bounded by `max_cached_logs`, keeping
+              entries cached but not yet persisted (the oldest are dropped if there are more than
+              `max_cached_logs`); calling it again, e.g. to switch tables, sends them to the new table
             - Retrieves and stores the Databricks job run ID in `self.job_run_id`
             - Stores reference to Spark session in `self.spark`
+            - Stores the schema of the cached entries in `self._schema`
         
         **Example:**
             ```python
@@ -365,12 +1089,42 @@ class databricksLogger:
             ```
         """
 
+        from pyspark.sql.types import StructType, StructField, StringType, TimestampType
+        
         if not spark.catalog.tableExists(uc_table_name):
             raise ValueError(f"Table '{uc_table_name}' does not exist in the catalog.")
 
+        # Fixed schema for cached entries, so persisting never has to infer or merge one
+        schema = StructType([
+            StructField(column, TimestampType() if column == 'timestamp' else StringType(), True)
+            for column in _CACHE_COLUMNS
+        ])
+        
+        # Appends no longer use mergeSchema, so check the table up front rather than failing on the
+        # first persist_cache(); tables written by earlier versions have a STRING timestamp column
+        table_types = {field.name.lower(): field.dataType for field in spark.table(uc_table_name).schema.fields}
+        problems = []
+        for field in schema.fields:
+            table_type = table_types.get(field.name)
+            if table_type is None:
+                problems.append(
+                    f"column '{field.name}' is missing; add it with "
+                    f"ALTER TABLE {uc_table_name} ADD COLUMNS ({field.name} {field.dataType.simpleString().upper()})"
+                )
+            elif table_type != field.dataType:
+                problems.append(
+                    f"column '{field.name}' is {table_type.simpleString().upper()} but must be "
+                    f"{field.dataType.simpleString().upper()}; see the upgrade note in CHANGELOG.md"
+                )
+        if problems:
+            raise ValueError(f"Table '{uc_table_name}' can't hold cached logs: " + "; ".join(problems))
+
         self.uc_table_name = uc_table_name
         self.caching = True
+        # Keep entries cached before a repeated call (e.g. to switch tables); they go to the new table
+        self.cached_logs = collections.deque(self.cached_logs, maxlen=max_cached_logs)
         self.spark = spark
+        self._schema = schema
             
         try:
             self.info("Retrieving job run ID from Databricks notebook context.")
@@ -382,21 +1136,65 @@ class databricksLogger:
                 self.caching = False
                 self.critical("Job run ID could not be determined from notebook context or fetched from job parameters; caching disabled.")
 
-    def persist_cache(self) -> None:
+    def _cached_logs_to_dataframe(self, entries: Any) -> Any:
+        """
+        Build a Spark DataFrame from cached log entry tuples.
+        
+        The tuples are transposed into one list per column and handed to Spark as a pandas DataFrame
+        with Arrow transfer enabled, so the rows cross to the JVM as one columnar batch instead of
+        being inferred and serialized one at a time. The session's Arrow setting is restored
+        afterwards. Falls back to the row-based path when pandas is not installed.
+        
+        **Parameters:**
+            entries (Iterable[tuple]): Cached log entries in `_CACHE_COLUMNS` order
+        
+        **Returns:**
+            pyspark.sql.DataFrame: The entries as a DataFrame with the schema set up by `init_caching()`
+        """
+        try:
+            import pandas as pd
+        except ImportError:
+            return self.spark.createDataFrame(list(entries), schema=self._schema)
+        
+        columns = dict(zip(_CACHE_COLUMNS, (list(column) for column in zip(*entries))))
+        pdf = pd.DataFrame(columns, columns=list(_CACHE_COLUMNS))
+        
+        arrow_key = "spark.sql.execution.arrow.pyspark.enabled"
+        arrow_setting = self.spark.conf.get(arrow_key, None)
+        self.spark.conf.set(arrow_key, "true")
+        try:
+            return self.spark.createDataFrame(pdf, schema=self._schema)
+        finally:
+            if arrow_setting is None:
+                self.spark.conf.unset(arrow_key)
+            else:
+                self.spark.conf.set(arrow_key, arrow_setting)
+    
+    def persist_cache(self, batch_size: int = 5000) -> None:
         """
         Persist all cached log messages to the Unity Catalog table.
         
         This method writes all cached log entries (accumulated via `cache_message=True` in logging methods)
-        to the target Unity Catalog table specified in `init_caching()`. Uses Spark's append mode with
-        schema merging to ensure compatibility.
+        to the target Unity Catalog table specified in `init_caching()`. The entries are written in
+        micro-batches of up to `batch_size` rows; each batch is transferred to Spark as one Arrow-backed
+        batch with the fixed schema from `init_caching()` (see `_cached_logs_to_dataframe`) and appended
+        to the table. An empty cache is skipped.
+        
+        **Parameters:**
+            batch_size (int): Maximum number of cached entries written per Spark append, so a large
+                cache is never shipped to the JVM in one huge transfer. Defaults to `5000`
         
         **Raises:**
             ValueError: If caching has not been initialized via `init_caching()`
+            ValueError: If `batch_size` is less than 1
             PySpark exceptions: If the write operation fails (table permissions, data format, etc.)
         
         **Side Effects:**
             - Writes cached log entries to the Unity Catalog table
-            - Clears `self.cached_logs` after successful persistence
+            - Removes each batch from `self.cached_logs` once it has been written, so if a write
+              fails only the entries not yet persisted remain cached. Entries cached while a batch is
+              written are persisted by a later batch; with `max_cached_logs`, they can also evict
+              older entries before those are written, which are then lost like any other eviction
             - Logs info and warning messages about the persistence operation
         
         **Returns:**
@@ -418,12 +1216,20 @@ class databricksLogger:
         """
         if not self.caching:
             raise ValueError("Caching is not enabled. Call 'init_caching' first.")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
 
         if len(self.cached_logs) == 0:
-            self.critical("No cached logs to persist.")
+            self.info("No cached logs to persist.")
         else:
             self.info(f"Persisting {len(self.cached_logs)} cached log entries to table '{self.uc_table_name}'.")
-            df = self.spark.createDataFrame(self.cached_logs)
-            df.write.mode("append").option("mergeSchema", "true").saveAsTable(self.uc_table_name)
-            self.info("Cached logs persisted successfully; flushing current cache.")
-            self.cached_logs = []
\ No newline at end of file
+            while self.cached_logs:
+                batch = list(itertools.islice(self.cached_logs, batch_size))
+                df = self._cached_logs_to_dataframe(batch)
+                df.write.mode("append").saveAsTable(self.uc_table_name)
+                # Drop the written entries by identity rather than by count: with `max_cached_logs`,
+                # entries cached during the write may already have evicted some of them
+                written = {id(entry) for entry in batch}
+                while self.cached_logs and id(self.cached_logs[0]) in written:
+                    self.cached_logs.popleft()
+            self.info("Cached logs persisted successfully; flushing current cache.")
\ No newline at end of file
@@ -0,0 +1,30 @@
+import os
+import sys
+import types
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from createDDLfromDataframe import createDDLfromDataframe
+
+
+class CreateDDLTest(unittest.TestCase):
+
+    def test_columns_are_listed_in_a_closed_statement(self):
+        df = types.SimpleNamespace(dtypes=[('id', 'bigint'), ('name', 'string')])
+        self.assertEqual(
+            createDDLfromDataframe(df, 'main.sales.orders'),
+            "CREATE OR REPLACE TABLE main.sales.orders (\n\tid bigint,\n\tname string\n)"
+        )
+
+    def test_single_column(self):
+        df = types.SimpleNamespace(dtypes=[('id', 'bigint')])
+        self.assertEqual(createDDLfromDataframe(df, 't'), "CREATE OR REPLACE TABLE t (\n\tid bigint\n)")
+
+    def test_dataframe_without_columns_is_rejected(self):
+        with self.assertRaises(ValueError):
+            createDDLfromDataframe(types.SimpleNamespace(dtypes=[]), 't')
+
+
+if __name__ == '__main__':
+    unittest.main()
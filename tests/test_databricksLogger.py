@@ -0,0 +1,720 @@
+import collections
+import contextlib
+import gc
+import importlib.util
+import inspect
+import io
+import os
+import queue
+import sys
+import threading
+import time
+import types
+import unittest
+from datetime import datetime
+from unittest import mock
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import databricks.sdk.runtime  # noqa: F401
+except ImportError:
+    # Off-cluster the Databricks runtime isn't importable; only init_caching()/persist_cache() use it
+    for name in ('databricks', 'databricks.sdk'):
+        sys.modules.setdefault(name, types.ModuleType(name))
+    runtime = types.ModuleType('databricks.sdk.runtime')
+    runtime.spark = runtime.display = runtime.dbutils = None
+    sys.modules['databricks.sdk.runtime'] = runtime
+
+from databricksLogger import databricksLogger, _ASYNC_BATCH_SIZE, _CACHE_COLUMNS
+
+LEVELS = ('INFO', 'SUCCESS', 'WARNING', 'ERROR', 'CRITICAL')
+
+
+class FlakyStdout(io.StringIO):
+    """A stdout whose first write raises `error`; later writes succeed"""
+
+    def __init__(self, error: BaseException):
+        super().__init__()
+        self.error = error
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        if self.writes == 1:
+            raise self.error
+        return super().write(text)
+
+
+class BlockedStdout(io.StringIO):
+    """A stdout whose writes wait until `release` is set, recording each write's text in `writes`"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.writes = []
+
+    def write(self, text: str) -> int:
+        self.release.wait()
+        self.writes.append(text)
+        return super().write(text)
+
+
+class FakeDataFrame:
+    """The rows handed to `FakeSpark.createDataFrame`, with a `write.mode().saveAsTable()` chain"""
+
+    def __init__(self, spark, rows, schema):
+        self.spark, self.rows, self.schema = spark, rows, schema
+        self.write = self
+
+    def mode(self, mode):
+        self.spark.write_modes.append(mode)
+        return self
+
+    def saveAsTable(self, name):
+        self.spark.save(name, self.rows)
+
+
+class FakeSpark:
+    """Just enough of a Spark session for `init_caching()` and `persist_cache()`"""
+
+    def __init__(self, table_schema=None, on_save=None):
+        self.table_schema = table_schema
+        self.on_save = on_save
+        self.saved = []
+        self.write_modes = []
+        self.schemas = []
+        self.settings = {}
+        self.catalog = types.SimpleNamespace(tableExists=lambda name: True)
+        self.conf = types.SimpleNamespace(
+            get=lambda key, default=None: self.settings.get(key, default),
+            set=self.settings.__setitem__,
+            unset=lambda key: self.settings.pop(key, None),
+        )
+
+    def table(self, name):
+        return types.SimpleNamespace(schema=self.table_schema)
+
+    def createDataFrame(self, data, schema):
+        self.schemas.append(schema)
+        # pandas DataFrames (the Arrow path) are turned back into row tuples
+        rows = [tuple(row) for row in data.itertuples(index=False)] if hasattr(data, 'itertuples') else list(data)
+        return FakeDataFrame(self, rows, schema)
+
+    def save(self, name, rows):
+        if self.on_save is not None:
+            self.on_save(rows)
+        self.saved.append(rows)
+
+
+class LoggerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # Color detection depends on these; start every test from a plain, non-Databricks environment
+        patcher = mock.patch.dict(os.environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        os.environ.pop('NO_COLOR', None)
+        os.environ.pop('DATABRICKS_RUNTIME_VERSION', None)
+
+    def make_logger(self, stdout=None, **kwargs):
+        """Build a logger writing to `stdout` (a fresh StringIO by default), closed after the test"""
+        stdout = io.StringIO() if stdout is None else stdout
+        kwargs.setdefault('config', '{message}')
+        with contextlib.redirect_stdout(stdout):
+            logger = databricksLogger(envr='prod', **kwargs)
+        self.addCleanup(logger.close)
+        return logger, stdout
+
+    def run_with_timeout(self, target, timeout=5):
+        """Run `target` in a thread and fail instead of hanging if it doesn't return in time"""
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(timeout)
+        self.assertFalse(thread.is_alive(), "call did not return")
+
+
+class CompiledRendererTest(LoggerTestCase):
+
+    CUSTOM = {'service': 'API', 'quoted': 'it\'s "q" \\ {x} }{', 'width': 12}
+    TEMPLATES = (
+        '[{timestamp}] : {message}',
+        '[{timestamp}] <{envr}> : {message}',
+        '{{literal}} {level} {message} }}{{',
+        '{message!r} {envr!r} {quoted!r} {level}',
+        '{level:>8}|{message}',
+        '{service:>5}|{quoted}|{message}',
+        '{message:{width}}|{level}',
+        '{timestamp}{message}{level}',
+        "'''{message}\"\"\" \\n {envr}",
+    )
+    MESSAGES = ('plain', "it's", 'a"b\\c {not a field} %s', 42)
+
+    def expected(self, config, timestamp, message, level):
+        return config.format(timestamp=timestamp, message=message, level=level, envr='prod', **self.CUSTOM)
+
+    def test_generic_renderer_matches_str_format(self):
+        for config in self.TEMPLATES:
+            logger, _ = self.make_logger(config=config, custom_config_values=self.CUSTOM)
+            for message in self.MESSAGES:
+                for level in LEVELS:
+                    with self.subTest(config=config, message=message, level=level):
+                        self.assertEqual(
+                            logger._compile_format()('2025-01-02 03:04:05', message, level),
+                            self.expected(config, '2025-01-02 03:04:05', message, level)
+                        )
+
+    def test_level_renderers_match_str_format_with_colors(self):
+        for config in self.TEMPLATES:
+            logger, _ = self.make_logger(config=config, custom_config_values=self.CUSTOM, force_color=True)
+            for level in LEVELS:
+                render = logger._compile_format(level)
+                color, reset = logger._wrap[level]
+                for message in self.MESSAGES:
+                    with self.subTest(config=config, message=message, level=level):
+                        self.assertEqual(
+                            render('ts', message, level),
+                            color + self.expected(config, 'ts', message, level) + reset
+                        )
+
+    def test_level_methods_write_rendered_lines(self):
+        config = '[{level}] {quoted} {message}'
+        logger, out = self.make_logger(config=config, custom_config_values=self.CUSTOM)
+        for level in LEVELS:
+            getattr(logger, level.lower())('m {x}')
+        self.assertEqual(out.getvalue(), ''.join(self.expected(config, '', 'm {x}', level) + '\n' for level in LEVELS))
+
+
+class TimestampCacheTest(LoggerTestCase):
+
+    def make_clocked_logger(self, seconds, **kwargs):
+        """Build a logger whose cached clock reads successive values from `seconds`"""
+        with mock.patch('time.time', side_effect=seconds):
+            return self.make_logger(config='[{timestamp}] {message}', timezone='UTC', **kwargs)
+
+    def test_timestamp_is_reused_within_a_second(self):
+        logger, out = self.make_clocked_logger([1700000000.2, 1700000000.9, 1700000001.0])
+        first = logger._now()
+        self.assertIs(logger._now(), first)
+        self.assertEqual(first[0], '2023-11-14 22:13:20')
+        self.assertEqual(first[1], datetime(2023, 11, 14, 22, 13, 20, tzinfo=ZoneInfo('UTC')))
+        self.assertEqual(logger._now()[0], '2023-11-14 22:13:21')
+
+    def test_cached_timestamp_uses_the_configured_timezone_and_format(self):
+        with mock.patch('time.time', return_value=1700000000.5):
+            logger, out = self.make_logger(
+                config='[{timestamp}] {message}', timezone='America/Chicago', timestamp_fmt='%d/%m/%Y %I:%M %p'
+            )
+        logger.info('m')
+        self.assertEqual(out.getvalue(), '[14/11/2023 04:13 PM] m\n')
+
+    def test_sub_second_formats_are_not_cached(self):
+        logger, _ = self.make_logger(timestamp_fmt='%H:%M:%S.%f')
+        self.assertFalse(logger._cache_timestamp)
+        first, second = logger._now(), logger._now()
+        self.assertIsNot(first, second)
+        self.assertRegex(first[0], r'^\d{2}:\d{2}:\d{2}\.\d{6}$')
+
+
+class TimezoneTest(LoggerTestCase):
+
+    def test_default_timezone_is_chicago(self):
+        self.assertEqual(self.make_logger()[0].timezone.key, 'America/Chicago')
+
+    def test_names_are_matched_case_insensitively(self):
+        self.assertEqual(self.make_logger(timezone='utc')[0].timezone.key, 'UTC')
+        self.assertEqual(self.make_logger(timezone='us/central')[0].timezone.key, 'US/Central')
+        self.assertEqual(self.make_logger(timezone='America/New_York')[0].timezone.key, 'America/New_York')
+
+    def test_unknown_and_malformed_names_raise_not_found(self):
+        for name in ('Not/A_Zone', '../etc/passwd', ''):
+            with self.subTest(name=name), self.assertRaises(ZoneInfoNotFoundError) as raised:
+                self.make_logger(timezone=name)
+            # A KeyError carrying the name, like pytz.UnknownTimeZoneError
+            self.assertIsInstance(raised.exception, KeyError)
+            self.assertEqual(raised.exception.args, (name,))
+
+
+class IsoTimestampTest(LoggerTestCase):
+
+    MOMENTS = (
+        datetime(2025, 11, 26, 14, 30, 5, 123456, tzinfo=ZoneInfo('America/Chicago')),
+        datetime(2024, 2, 29, 23, 59, 59, 999999, tzinfo=ZoneInfo('UTC')),
+        datetime(2025, 3, 9, 3, 0, 0, 0, tzinfo=ZoneInfo('America/Chicago')),
+    )
+
+    def test_iso_shaped_formats_match_strftime(self):
+        for timestamp_fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S.%f'):
+            logger, _ = self.make_logger(timestamp_fmt=timestamp_fmt)
+            self.assertIsNotNone(logger._iso_format)
+            for moment in self.MOMENTS:
+                with self.subTest(timestamp_fmt=timestamp_fmt, moment=moment):
+                    self.assertEqual(logger._render_timestamp(moment), moment.strftime(timestamp_fmt))
+
+    def test_fields_are_zero_padded(self):
+        moment = datetime(2025, 1, 2, 3, 4, 5, 6, tzinfo=ZoneInfo('UTC'))
+        logger, _ = self.make_logger(timestamp_fmt='%Y-%m-%dT%H:%M:%S.%f')
+        self.assertEqual(logger._render_timestamp(moment), '2025-01-02T03:04:05.000006')
+        logger, _ = self.make_logger(timestamp_fmt='%Y-%m-%d %H:%M:%S')
+        self.assertEqual(logger._render_timestamp(moment.replace(hour=0, minute=0, second=0)), '2025-01-02 00:00:00')
+
+    def test_other_formats_use_strftime(self):
+        logger, _ = self.make_logger(timestamp_fmt='%Y-%m-%d %H:%M:%S %Z')
+        self.assertIsNone(logger._iso_format)
+        self.assertEqual(logger._render_timestamp(self.MOMENTS[0]), '2025-11-26 14:30:05 CST')
+
+
+class BufferedOutputTest(LoggerTestCase):
+
+    def test_lines_are_written_when_the_buffer_fills(self):
+        logger, out = self.make_logger(buffer_lines=3)
+        logger.info('a')
+        logger.info('b')
+        self.assertEqual(out.getvalue(), '')
+        logger.info('c')
+        self.assertEqual(out.getvalue(), 'a\nb\nc\n')
+        logger.info('d')
+        logger.flush()
+        self.assertEqual(out.getvalue(), 'a\nb\nc\nd\n')
+
+    def test_flush_interval_writes_a_partial_buffer(self):
+        logger, out = self.make_logger(buffer_lines=10, flush_interval=0.05)
+        logger.info('a')
+        deadline = time.monotonic() + 5
+        while not out.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(out.getvalue(), 'a\n')
+
+    def test_buffer_lines_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            self.make_logger(buffer_lines=0)
+
+
+class AsyncOutputTest(LoggerTestCase):
+
+    def test_flush_writes_everything_in_order(self):
+        logger, out = self.make_logger(async_write=True)
+        for i in range(500):
+            logger.info(str(i))
+        logger.flush()
+        self.assertEqual(out.getvalue(), ''.join(f'{i}\n' for i in range(500)))
+
+    def test_full_buffer_does_not_wait_for_the_writer(self):
+        stdout = BlockedStdout()
+        logger, out = self.make_logger(stdout, async_write=True, buffer_lines=2)
+
+        def log():
+            for i in range(10):
+                logger.info(str(i))
+
+        self.run_with_timeout(log, timeout=2)
+        stdout.release.set()
+        logger.flush()
+        self.assertEqual(out.getvalue(), ''.join(f'{i}\n' for i in range(10)))
+
+    def test_failed_write_is_reported_and_does_not_hang(self):
+        stderr = io.StringIO()
+        logger, out = self.make_logger(FlakyStdout(ValueError('I/O operation on closed file')), async_write=True)
+
+        def log():
+            logger.error('lost')
+            logger.error('kept')
+
+        with mock.patch.object(sys, '__stderr__', stderr):
+            self.run_with_timeout(log)
+        self.assertIn('ValueError', stderr.getvalue())
+        self.assertTrue(logger._writer_thread.is_alive())
+        self.assertEqual(out.getvalue(), 'kept\n')
+
+    def test_stopped_writer_falls_back_to_synchronous_writes(self):
+        # SystemExit is not caught by the writer loop, so the thread exits on the first write
+        logger, out = self.make_logger(FlakyStdout(SystemExit()), async_write=True)
+
+        def log():
+            logger.info('lost')
+            logger._writer_thread.join(5)
+            logger.info('a')
+            logger.flush()
+
+        self.run_with_timeout(log)
+        self.assertEqual(out.getvalue(), 'a\n')
+
+    def test_close_stops_the_writer_thread(self):
+        logger, out = self.make_logger(async_write=True)
+        logger.info('a')
+        logger.close()
+        self.assertFalse(logger._writer_thread.is_alive())
+        logger.info('b')
+        self.assertEqual(out.getvalue(), 'a\nb\n')
+
+    def test_close_flushes_a_buffered_logger_and_then_writes_directly(self):
+        logger, out = self.make_logger(buffer_lines=10)
+        logger.info('a')
+        logger.close()
+        self.assertEqual(out.getvalue(), 'a\n')
+        logger.info('b')
+        self.assertEqual(out.getvalue(), 'a\nb\n')
+
+    def test_collected_logger_writes_its_buffer_and_stops_its_thread(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            logger = databricksLogger(envr='prod', config='{message}', async_write=True, buffer_lines=10)
+        writer_thread = logger._writer_thread
+        logger.info('pending')
+        del logger
+        gc.collect()
+        writer_thread.join(5)
+        self.assertFalse(writer_thread.is_alive())
+        self.assertEqual(out.getvalue(), 'pending\n')
+
+
+class LevelEmitterTest(LoggerTestCase):
+
+    def test_level_methods_keep_their_signature_and_docstring(self):
+        logger, _ = self.make_logger()
+        for level in LEVELS:
+            method = getattr(logger, level.lower())
+            with self.subTest(level=level):
+                self.assertEqual(method.__name__, level.lower())
+                self.assertEqual(method.__doc__, getattr(databricksLogger, level.lower()).__doc__)
+                self.assertEqual(list(inspect.signature(method).parameters), ['message', 'args', 'cache_message', 'kwargs'])
+
+    def test_subclass_overrides_are_kept(self):
+        class PrefixLogger(databricksLogger):
+            def info(self, message, *args, **kwargs):
+                super().info('sub: ' + message, *args, **kwargs)
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            logger = PrefixLogger(envr='prod', config='{level} {message}')
+        logger.info('a %d', 1)
+        logger.log('info', 'b')
+        logger.warning('c')
+        self.assertEqual(out.getvalue(), 'INFO sub: a 1\nINFO sub: b\nWARNING c\n')
+
+
+class ColorOutputTest(LoggerTestCase):
+
+    RED, RESET = databricksLogger.COLORS['ERROR'], databricksLogger.COLORS['RESET']
+
+    def error_line(self, stdout=None, **kwargs):
+        logger, out = self.make_logger(stdout, **kwargs)
+        logger.error('e')
+        logger.info('i')
+        return out.getvalue()
+
+    def test_colors_off_when_stdout_is_not_a_tty(self):
+        self.assertEqual(self.error_line(), 'e\ni\n')
+
+    def test_colors_on_for_a_tty_without_a_reset_for_info(self):
+        stdout = io.StringIO()
+        stdout.isatty = lambda: True
+        self.assertEqual(self.error_line(stdout), f'{self.RED}e{self.RESET}\ni\n')
+
+    def test_force_color_and_no_color(self):
+        self.assertEqual(self.error_line(force_color=True), f'{self.RED}e{self.RESET}\ni\n')
+        os.environ['NO_COLOR'] = '1'
+        os.environ['DATABRICKS_RUNTIME_VERSION'] = '15.4'
+        self.assertEqual(self.error_line(), 'e\ni\n')
+        self.assertEqual(self.error_line(force_color=True), f'{self.RED}e{self.RESET}\ni\n')
+
+    def test_colors_on_in_databricks_notebooks(self):
+        os.environ['DATABRICKS_RUNTIME_VERSION'] = '15.4'
+        self.assertEqual(self.error_line(), f'{self.RED}e{self.RESET}\ni\n')
+
+    def test_colors_off_in_databricks_job_runs(self):
+        os.environ['DATABRICKS_RUNTIME_VERSION'] = '15.4'
+        context = mock.Mock()
+        context.notebook.entry_point.getDbutils().notebook().getContext().jobId().isDefined.return_value = True
+        with mock.patch('databricksLogger.dbutils', context):
+            self.assertEqual(self.error_line(), 'e\ni\n')
+            self.assertEqual(self.error_line(force_color=True), f'{self.RED}e{self.RESET}\ni\n')
+
+
+class MinLevelTest(LoggerTestCase):
+
+    def test_calls_below_min_level_are_dropped_before_formatting(self):
+        logger, out = self.make_logger(min_level='WARNING')
+        unprintable = mock.Mock(__str__=mock.Mock(side_effect=AssertionError("formatted a muted message")))
+        logger.info('%s', unprintable)
+        logger.success('%s', unprintable)
+        logger.warning('w')
+        logger.critical('c')
+        self.assertEqual(out.getvalue(), 'w\nc\n')
+
+    def test_min_level_is_case_insensitive_and_validated(self):
+        self.assertEqual(self.make_logger(min_level='error')[0].min_level, 'ERROR')
+        with self.assertRaises(ValueError):
+            self.make_logger(min_level='VERBOSE')
+
+
+class MessageArgumentsTest(LoggerTestCase):
+
+    def test_deferred_arguments_are_interpolated(self):
+        logger, out = self.make_logger()
+        logger.info('%s rows from %s', 3, 't')
+        logger.info('%(rows)d rows', {'rows': 4})
+        logger.info('{rows} rows from {table.name}', rows=5, table=types.SimpleNamespace(name='u'))
+        logger.info('{value:{width}}|{flag}', value=3, width=5, flag=True)
+        logger.info('50% done {x}')
+        self.assertEqual(out.getvalue(), '3 rows from t\n4 rows\n5 rows from u\n    3|True\n50% done {x}\n')
+
+    def test_unused_keyword_arguments_are_rejected(self):
+        logger, out = self.make_logger()
+        with self.assertRaisesRegex(TypeError, 'cache_mesage'):
+            logger.info('message', cache_mesage=True)
+        with self.assertRaisesRegex(TypeError, 'cache_mesage'):
+            logger.info('Loaded %d rows', 5, cache_mesage=True)
+        with self.assertRaisesRegex(TypeError, 'not both'):
+            logger.info('%s {x}', 1, x=2)
+        self.assertEqual(out.getvalue(), '')
+
+    def test_positional_cache_flag_still_caches_with_a_warning(self):
+        logger, out = self.make_logger()
+        logger.caching, logger.job_run_id = True, 'run-1'
+        for message in ('message', 'Loaded 50%', 'Job 100% done'):
+            with self.subTest(message=message), self.assertWarns(DeprecationWarning):
+                logger.info(message, True)
+        with self.assertWarns(DeprecationWarning):
+            logger.info('skipped', False)
+        self.assertEqual(out.getvalue(), 'message\nLoaded 50%\nJob 100% done\nskipped\n')
+        self.assertEqual([entry[-1] for entry in logger.cached_logs], ['message', 'Loaded 50%', 'Job 100% done'])
+
+
+@unittest.skipUnless(importlib.util.find_spec('pyspark'), "pyspark is not installed")
+class CachingTestCase(LoggerTestCase):
+
+    def make_caching_logger(self, spark=None, max_cached_logs=None, **kwargs):
+        """Build a logger with caching initialized against `spark` (a fresh `FakeSpark` by default)"""
+        from pyspark.sql.types import StructType, StructField, StringType, TimestampType
+        if spark is None:
+            spark = FakeSpark()
+        if spark.table_schema is None:
+            spark.table_schema = StructType([
+                StructField(column, TimestampType() if column == 'timestamp' else StringType())
+                for column in _CACHE_COLUMNS
+            ])
+        dbutils = mock.Mock()
+        dbutils.notebook.entry_point.getDbutils().notebook().getContext().jobId().get.return_value = 'run-1'
+        for name, value in (('spark', spark), ('dbutils', dbutils)):
+            patcher = mock.patch(f'databricksLogger.{name}', value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        logger, out = self.make_logger(**kwargs)
+        logger.init_caching('main.logs.job_logs', max_cached_logs=max_cached_logs)
+        return logger, spark
+
+
+class LogCacheTest(CachingTestCase):
+
+    def test_entries_are_cached_as_tuples(self):
+        logger, _ = self.make_caching_logger()
+        logger.info('a', cache_message=True)
+        logger.info('not cached')
+        logger.error('%d failed', 2, cache_message=True)
+        self.assertIsInstance(logger.cached_logs, collections.deque)
+        self.assertEqual(
+            [(run, level, envr, message) for run, _, level, envr, message in logger.cached_logs],
+            [('run-1', 'INFO', 'prod', 'a'), ('run-1', 'ERROR', 'prod', '2 failed')]
+        )
+
+    def test_max_cached_logs_keeps_the_newest_entries(self):
+        logger, _ = self.make_caching_logger(max_cached_logs=2)
+        for message in ('a', 'b', 'c'):
+            logger.info(message, cache_message=True)
+        self.assertEqual([entry[-1] for entry in logger.cached_logs], ['b', 'c'])
+
+    def test_init_caching_again_keeps_unpersisted_entries(self):
+        logger, spark = self.make_caching_logger()
+        logger.info('a', cache_message=True)
+        logger.init_caching('main.logs.other_logs', max_cached_logs=5)
+        self.assertEqual([entry[-1] for entry in logger.cached_logs], ['a'])
+        self.assertEqual(logger.cached_logs.maxlen, 5)
+
+    def test_entries_evicted_during_a_write_do_not_drop_newer_ones(self):
+        def log_during_first_write(rows):
+            if not spark.saved:
+                logger.info('d', cache_message=True)
+                logger.info('e', cache_message=True)
+
+        spark = FakeSpark(on_save=log_during_first_write)
+        logger, _ = self.make_caching_logger(spark, max_cached_logs=3)
+        for message in ('a', 'b', 'c'):
+            logger.info(message, cache_message=True)
+        logger.persist_cache()
+        self.assertEqual([[row[-1] for row in rows] for rows in spark.saved], [['a', 'b', 'c'], ['d', 'e']])
+        self.assertEqual(len(logger.cached_logs), 0)
+
+
+class UrgentFlushTest(LoggerTestCase):
+
+    def test_error_and_critical_flush_buffered_lines_in_order(self):
+        logger, out = self.make_logger(buffer_lines=10)
+        logger.info('a')
+        logger.error('e')
+        self.assertEqual(out.getvalue(), 'a\ne\n')
+        logger.warning('w')
+        logger.critical('c')
+        self.assertEqual(out.getvalue(), 'a\ne\nw\nc\n')
+
+    def test_error_waits_for_the_async_writer(self):
+        logger, out = self.make_logger(async_write=True, buffer_lines=10)
+        for i in range(20):
+            logger.info(str(i))
+        logger.error('e')
+        self.assertEqual(out.getvalue(), ''.join(f'{i}\n' for i in range(20)) + 'e\n')
+
+
+class SetLevelTest(LoggerTestCase):
+
+    def test_set_level_changes_the_threshold(self):
+        logger, out = self.make_logger(min_level='error')
+        logger.warning('dropped')
+        logger.set_level('info')
+        logger.info('kept')
+        self.assertEqual(logger.min_level, 'INFO')
+        self.assertEqual(out.getvalue(), 'kept\n')
+
+    def test_log_dispatches_on_a_runtime_level(self):
+        logger, out = self.make_logger(config='{level} {message}', min_level='WARNING')
+        unprintable = mock.Mock(__str__=mock.Mock(side_effect=AssertionError("formatted a muted message")))
+        logger.log('info', '%s', unprintable)
+        logger.log('Warning', '%d retries', 3)
+        logger.log('CRITICAL', '{name} down', name='db')
+        self.assertEqual(out.getvalue(), 'WARNING 3 retries\nCRITICAL db down\n')
+
+    def test_unknown_levels_are_rejected(self):
+        logger, _ = self.make_logger()
+        with self.assertRaises(ValueError):
+            logger.set_level('VERBOSE')
+        with self.assertRaises(ValueError):
+            logger.log('VERBOSE', 'message')
+
+
+class BoundedQueueTest(LoggerTestCase):
+
+    def test_bounded_queue_keeps_order(self):
+        logger, out = self.make_logger(async_write=True, async_queue_size=4)
+        for i in range(300):
+            logger.info(str(i))
+        logger.flush()
+        self.assertIsInstance(logger._queue, queue.Queue)
+        self.assertEqual(out.getvalue(), ''.join(f'{i}\n' for i in range(300)))
+
+    def test_full_queue_does_not_block_once_the_writer_has_stopped(self):
+        # SystemExit is not caught by the writer loop, so the thread exits on the first write
+        logger, out = self.make_logger(FlakyStdout(SystemExit()), async_write=True, async_queue_size=4)
+
+        def log():
+            logger.info('lost')
+            logger._writer_thread.join(5)
+            for i in range(10):
+                logger.info(str(i))
+            logger.error('done')
+
+        self.run_with_timeout(log)
+        self.assertEqual(out.getvalue(), ''.join(f'{i}\n' for i in range(10)) + 'done\n')
+
+    def test_writer_joins_queued_writes_in_batches(self):
+        stdout = BlockedStdout()
+        logger, out = self.make_logger(stdout, async_write=True)
+        for i in range(600):
+            logger.info(str(i))
+        stdout.release.set()
+        logger.flush()
+        self.assertEqual(out.getvalue(), ''.join(f'{i}\n' for i in range(600)))
+        self.assertLess(len(stdout.writes), 10)
+        self.assertLessEqual(max(text.count('\n') for text in stdout.writes), _ASYNC_BATCH_SIZE)
+
+
+class PersistSchemaTest(CachingTestCase):
+
+    def test_persist_appends_with_the_fixed_schema(self):
+        logger, spark = self.make_caching_logger()
+        logger.info('a', cache_message=True)
+        logger.persist_cache()
+        self.assertEqual(spark.schemas, [logger._schema])
+        self.assertEqual(logger._schema.fieldNames(), list(_CACHE_COLUMNS))
+        self.assertEqual(spark.write_modes, ['append'])
+        self.assertEqual([row[-1] for row in spark.saved[0]], ['a'])
+
+
+class CachedTimestampTest(CachingTestCase):
+
+    def test_cache_keeps_the_printed_moment_as_a_datetime(self):
+        from pyspark.sql.types import TimestampType
+        with mock.patch('time.time', return_value=1700000000.5):
+            logger, _ = self.make_caching_logger(config='[{timestamp}] {message}', timezone='UTC')
+        logger.info('a', cache_message=True)
+        moment = logger.cached_logs[0][_CACHE_COLUMNS.index('timestamp')]
+        self.assertEqual(moment, datetime(2023, 11, 14, 22, 13, 20, tzinfo=ZoneInfo('UTC')))
+        self.assertEqual(logger._schema['timestamp'].dataType, TimestampType())
+
+    def test_init_caching_rejects_a_string_timestamp_column(self):
+        from pyspark.sql.types import StructType, StructField, StringType
+        legacy_schema = StructType([StructField(column, StringType()) for column in _CACHE_COLUMNS])
+        with self.assertRaisesRegex(ValueError, "'timestamp' is STRING but must be TIMESTAMP.*CHANGELOG"):
+            self.make_caching_logger(FakeSpark(table_schema=legacy_schema))
+
+    def test_init_caching_rejects_a_missing_column(self):
+        from pyspark.sql.types import StructType, StructField, StringType, TimestampType
+        schema = StructType([
+            StructField(column, TimestampType() if column == 'timestamp' else StringType())
+            for column in _CACHE_COLUMNS if column != 'envr'
+        ])
+        with self.assertRaisesRegex(ValueError, r"ADD COLUMNS \(envr STRING\)"):
+            self.make_caching_logger(FakeSpark(table_schema=schema))
+
+
+class PersistBatchTest(CachingTestCase):
+
+    def cache(self, logger, count):
+        for i in range(count):
+            logger.info(str(i), cache_message=True)
+
+    def test_large_caches_are_written_in_batches(self):
+        logger, spark = self.make_caching_logger()
+        self.cache(logger, 12001)
+        logger.persist_cache()
+        self.assertEqual([len(rows) for rows in spark.saved], [5000, 5000, 2001])
+        self.assertEqual([row[-1] for rows in spark.saved for row in rows], [str(i) for i in range(12001)])
+        self.assertEqual(len(logger.cached_logs), 0)
+
+    def test_batch_size_is_configurable_and_validated(self):
+        logger, spark = self.make_caching_logger()
+        self.cache(logger, 5)
+        logger.persist_cache(batch_size=2)
+        self.assertEqual([len(rows) for rows in spark.saved], [2, 2, 1])
+        with self.assertRaises(ValueError):
+            logger.persist_cache(batch_size=0)
+
+    def test_failed_batch_leaves_only_unwritten_entries_cached(self):
+        def fail_on_second_batch(rows):
+            if spark.saved:
+                raise RuntimeError("write failed")
+
+        spark = FakeSpark(on_save=fail_on_second_batch)
+        logger, _ = self.make_caching_logger(spark)
+        self.cache(logger, 5)
+        with self.assertRaisesRegex(RuntimeError, "write failed"):
+            logger.persist_cache(batch_size=2)
+        self.assertEqual([entry[-1] for entry in logger.cached_logs], ['2', '3', '4'])
+
+        spark.on_save = None
+        logger.persist_cache(batch_size=2)
+        self.assertEqual([row[-1] for rows in spark.saved for row in rows], ['0', '1', '2', '3', '4'])
+
+    def test_empty_cache_writes_nothing(self):
+        logger, spark = self.make_caching_logger()
+        logger.persist_cache()
+        self.assertEqual(spark.saved, [])
+
+    def test_persist_requires_init_caching(self):
+        logger, _ = self.make_logger()
+        with self.assertRaises(ValueError):
+            logger.persist_cache()
+
+
+if __name__ == '__main__':
+    unittest.main()